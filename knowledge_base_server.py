@@ -18,14 +18,24 @@ License: MIT
 """
 
 import asyncio
+import hashlib
+import heapq
 import json
+import operator
+import re
+from collections import Counter, OrderedDict, namedtuple
 from datetime import datetime
-from typing import Literal, Optional, List, Dict, Any
+from typing import Literal, Optional, List, Dict, Any, Tuple
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from mcp.server import Server
 from mcp.types import Tool, TextContent
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
 
 # ============================================================================
 # CONFIGURATION
@@ -34,6 +44,15 @@ from pydantic import BaseModel, Field, ConfigDict
 # Character limit for responses to respect Claude's context window
 CHARACTER_LIMIT = 25000
 
+# Shortest single-word query that falls back to a substring scan of the corpus
+MIN_SUBSTRING_QUERY_LENGTH = 2
+
+# Number of queries whose full ranking is kept for pagination
+SCORED_CACHE_SIZE = 256
+
+# Marker appended to truncated responses
+_TRUNC_SUFFIX = "\n\n[Content truncated to fit context limit]"
+
 # Simulated knowledge base (in production, this would be a database/API)
 KNOWLEDGE_BASE = [
     {
@@ -195,6 +214,96 @@ KNOWLEDGE_BASE = [
     }
 ]
 
+# ============================================================================
+# SEARCH INDEX
+# ============================================================================
+
+# Relevance weight per document field
+FIELD_WEIGHTS = {
+    "title": 10.0,
+    "tags": 5.0,
+    "category": 3.0,
+    "content": 2.0
+}
+
+# Document lookup by ID
+_ID_TO_DOC: Dict[str, Dict[str, Any]] = {doc['id']: doc for doc in KNOWLEDGE_BASE}
+_ID_TO_IDX: Dict[str, int] = {doc['id']: idx for idx, doc in enumerate(KNOWLEDGE_BASE)}
+
+# Category statistics
+_CATEGORY_COUNTS = Counter(doc['category'] for doc in KNOWLEDGE_BASE)
+_SORTED_CATEGORIES: List[str] = sorted(_CATEGORY_COUNTS)
+
+# Document indices grouped by lowercase category (list for scans, set for filtering)
+_DOCS_BY_CATEGORY: Dict[str, List[int]] = {}
+_DOC_SETS_BY_CATEGORY: Dict[str, frozenset] = {}
+
+# Lowercased fields and preformatted content, indexed like KNOWLEDGE_BASE
+DocMeta = namedtuple('DocMeta', [
+    'title_lc',
+    'content_lc_bytes',
+    'content_len',
+    'title_tokens',
+    'content_counter',
+    'tag_tokens',
+    'category_tokens',
+    'tags_lc',
+    'category_lc',
+    'first_line',
+    'content_stripped'
+])
+_DOC_META: List[DocMeta] = []
+
+# Word tokenizer shared by index building and query parsing
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Inverted index: token -> [(document index, field, term frequency), ...]
+_INVERTED_INDEX: Dict[str, List[Tuple[int, str, int]]] = {}
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _build_index() -> None:
+    """Build the search structures over KNOWLEDGE_BASE (run once at import)"""
+    for idx, doc in enumerate(KNOWLEDGE_BASE):
+        _DOCS_BY_CATEGORY.setdefault(doc['category'].lower(), []).append(idx)
+        
+        fields = {
+            "title": doc['title'],
+            "content": doc['content'],
+            "tags": " ".join(doc['tags']),
+            "category": doc['category']
+        }
+        counters = {field: Counter(_tokenize(text)) for field, text in fields.items()}
+        content_lc_bytes = doc['content'].lower().encode('utf-8')
+        
+        _DOC_META.append(DocMeta(
+            title_lc=doc['title'].lower(),
+            content_lc_bytes=content_lc_bytes,
+            content_len=len(content_lc_bytes),
+            title_tokens=set(counters["title"]),
+            content_counter=counters["content"],
+            tag_tokens=set(counters["tags"]),
+            category_tokens=set(counters["category"]),
+            tags_lc=tuple(tag.lower() for tag in doc['tags']),
+            category_lc=doc['category'].lower(),
+            first_line=next((ln.strip() for ln in doc['content'].split('\n') if ln.strip()), ""),
+            content_stripped=doc['content'].strip()
+        ))
+        
+        for field, counter in counters.items():
+            for token, tf in counter.items():
+                _INVERTED_INDEX.setdefault(token, []).append((idx, field, tf))
+    
+    for cat, indices in _DOCS_BY_CATEGORY.items():
+        _DOC_SETS_BY_CATEGORY[cat] = frozenset(indices)
+
+
+_build_index()
+
 # ============================================================================
 # DATA MODELS
 # ============================================================================
@@ -235,6 +344,17 @@ class SearchInput(BaseModel):
         le=10
     )
     
+    offset: int = Field(
+        default=0,
+        description="Number of ranked results to skip, for fetching the next page (use next_offset from the previous response)",
+        ge=0
+    )
+    
+    cursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor from a previous search response; must be sent with the same query and category; reuses its ranking instead of searching again"
+    )
+    
     format: ResponseFormat = Field(
         default=ResponseFormat.MARKDOWN,
         description="Response format: 'json' for structured data, 'markdown' for human-readable text"
@@ -271,69 +391,133 @@ class ListCategoriesInput(BaseModel):
     )
 
 
+# Cached validators for tool arguments (built once, reused on every call)
+_SEARCH_ADAPTER = TypeAdapter(SearchInput)
+_GET_DOCUMENT_ADAPTER = TypeAdapter(GetDocumentInput)
+_LIST_CATEGORIES_ADAPTER = TypeAdapter(ListCategoriesInput)
+
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
 
+def _json_dumps(obj: Any) -> str:
+    """Serialize to indented JSON, using the orjson C encoder when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
 def truncate_text(text: str, max_chars: int = CHARACTER_LIMIT) -> str:
     """Truncate text to maximum character limit"""
     if len(text) <= max_chars:
         return text
-    return text[:max_chars - 50] + "\n\n[Content truncated to fit context limit]"
-
-
-def format_document_markdown(doc: Dict[str, Any], detail_level: DetailLevel) -> str:
-    """Format a document as Markdown"""
-    lines = [
-        f"## {doc['title']}",
-        f"**ID:** {doc['id']}",
-        f"**Category:** {doc['category']}",
-        f"**Tags:** {', '.join(doc['tags'])}",
-        f"**Last Updated:** {doc['updated']}",
-        ""
-    ]
+    return text[:max_chars - 50] + _TRUNC_SUFFIX
+
+
+def fit_results_to_limit(
+    results: List[Dict[str, Any]],
+    detail_level: DetailLevel
+) -> List[Dict[str, Any]]:
+    """
+    Keep the leading results whose estimated formatted size fits CHARACTER_LIMIT.
+    
+    Avoids building a response that truncate_text would mostly discard. The
+    first result is always kept; dropped results remain reachable via paging.
+    """
+    # Detailed output carries full content; concise output only a summary line
+    factor = 2.0 if detail_level == DetailLevel.DETAILED else 0.2
+    estimated_size = 0.0
+    for count, doc in enumerate(results):
+        estimated_size += _DOC_META[_ID_TO_IDX[doc['id']]].content_len * factor
+        if estimated_size > CHARACTER_LIMIT and count > 0:
+            return results[:count]
+    return results
+
+
+# Markdown templates for a single document, filled with str.format_map
+_MD_HEADER_TEMPLATE = (
+    "## {title}\n"
+    "**ID:** {id}\n"
+    "**Category:** {category}\n"
+    "**Tags:** {tags}\n"
+    "**Last Updated:** {updated}\n"
+    "\n"
+)
+_MD_CONCISE_TEMPLATE = _MD_HEADER_TEMPLATE + "**Summary:** {summary}"
+_MD_DETAILED_TEMPLATE = _MD_HEADER_TEMPLATE + "### Content\n{content}"
+
+
+def format_document_markdown(doc: Dict[str, Any], detail_level: DetailLevel, out: List[str]) -> None:
+    """Append a document formatted as Markdown to out"""
+    meta = _DOC_META[_ID_TO_IDX[doc['id']]]
+    fields = {
+        "title": doc['title'],
+        "id": doc['id'],
+        "category": doc['category'],
+        "tags": ", ".join(doc['tags']),
+        "updated": doc['updated']
+    }
     
     if detail_level == DetailLevel.DETAILED:
-        lines.append("### Content")
-        lines.append(doc['content'].strip())
+        fields["content"] = meta.content_stripped
+        out.append(_MD_DETAILED_TEMPLATE.format_map(fields))
     else:
         # Concise: just first paragraph
-        content_lines = [line.strip() for line in doc['content'].strip().split('\n') if line.strip()]
-        first_para = content_lines[0] if content_lines else ""
-        lines.append(f"**Summary:** {first_para}")
-    
-    return "\n".join(lines)
+        fields["summary"] = meta.first_line
+        out.append(_MD_CONCISE_TEMPLATE.format_map(fields))
 
 
-def calculate_relevance_score(doc: Dict[str, Any], query: str) -> float:
-    """Calculate a simple relevance score for a document"""
-    query_lower = query.lower()
-    score = 0.0
-    
-    # Title match (highest weight)
-    if query_lower in doc['title'].lower():
-        score += 10.0
+def calculate_relevance_score(
+    idx: int,
+    query_lower: str,
+    query_bytes: bytes,
+    query_tokens: List[str]
+) -> float:
+    """
+    Calculate a simple relevance score for the document at index idx.
     
-    # Content match
-    content_matches = doc['content'].lower().count(query_lower)
-    score += content_matches * 2.0
+    query_bytes is the UTF-8 encoding of query_lower, used for the content scan.
+    """
+    meta = _DOC_META[idx]
+    score = 0.0
     
-    # Tag matches
-    for tag in doc['tags']:
-        if query_lower in tag.lower():
-            score += 5.0
+    # Per-word matches
+    for token in query_tokens:
+        if token in meta.title_tokens:
+            score += FIELD_WEIGHTS["title"]
+        score += meta.content_counter[token] * FIELD_WEIGHTS["content"]
+        if token in meta.tag_tokens:
+            score += FIELD_WEIGHTS["tags"]
+        if token in meta.category_tokens:
+            score += FIELD_WEIGHTS["category"]
     
-    # Category match
-    if query_lower in doc['category'].lower():
-        score += 3.0
+    # Exact phrase (or partial word) matches rank above scattered words
+    if query_lower in meta.title_lc:
+        score += FIELD_WEIGHTS["title"]
+    for tag in meta.tags_lc:
+        if query_lower in tag:
+            score += FIELD_WEIGHTS["tags"]
+    if query_lower in meta.category_lc:
+        score += FIELD_WEIGHTS["category"]
+    content_matches = meta.content_lc_bytes.count(query_bytes)
+    score += content_matches * FIELD_WEIGHTS["content"]
     
     return score
 
 
-async def search_documents(
+# A page of ranked search results and the cursor for fetching further pages
+SearchPage = namedtuple('SearchPage', ['documents', 'cursor', 'total_results'])
+
+# Ranked document IDs per cursor, least recently used first
+_LRU_SCORED_CACHE: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+
+
+def search_documents(
     query: str,
     category: Optional[str] = None,
-    max_results: int = 5
+    max_results: int = 5,
+    offset: int = 0
 ) -> List[Dict[str, Any]]:
     """
     Search knowledge base and return relevant documents.
@@ -341,41 +525,147 @@ async def search_documents(
     In production, this would query a real database or search engine.
     This simulation demonstrates the pattern.
     """
-    # Simulate async I/O (in production, this would be a database query)
-    await asyncio.sleep(0.01)
+    return search_documents_page(query, category, max_results, offset).documents
+
+
+def search_documents_page(
+    query: str,
+    category: Optional[str] = None,
+    max_results: int = 5,
+    offset: int = 0,
+    cursor: Optional[str] = None
+) -> SearchPage:
+    """
+    Search knowledge base and return a page of results with its cursor.
     
-    # Filter by category if specified
-    documents = KNOWLEDGE_BASE
+    Rankings are cached per query and category, so fetching later pages
+    (same cursor, larger offset) skips scoring entirely. A cursor issued
+    for a different query or category is rejected.
+    """
+    query_norm = query.lower().strip()
+    category_norm = category.lower() if category else None
+    
+    expected_cursor = _make_cursor(query_norm, category_norm)
+    if cursor and cursor != expected_cursor:
+        raise ValueError(
+            "cursor does not belong to this query and category; "
+            "repeat the original query and category, or omit the cursor"
+        )
+    cursor = expected_cursor
+    
+    doc_ids = _LRU_SCORED_CACHE.get(cursor)
+    if doc_ids is None:
+        # Rank every match (IDs only) so all pages stay reachable
+        doc_ids = _search_ids(query_norm, category_norm, len(KNOWLEDGE_BASE))
+        _LRU_SCORED_CACHE[cursor] = doc_ids
+        if len(_LRU_SCORED_CACHE) > SCORED_CACHE_SIZE:
+            _LRU_SCORED_CACHE.popitem(last=False)
+    else:
+        _LRU_SCORED_CACHE.move_to_end(cursor)
+    
+    documents = [_ID_TO_DOC[doc_id] for doc_id in doc_ids[offset:offset + max_results]]
+    return SearchPage(documents, cursor, len(doc_ids))
+
+
+def _make_cursor(query_norm: str, category: Optional[str]) -> str:
+    """Derive the opaque cursor token for a normalized query and category"""
+    key = f"{query_norm}\x00{category or ''}".encode('utf-8')
+    return hashlib.sha256(key).hexdigest()[:16]
+
+
+def _search_ids(
+    query_norm: str,
+    category: Optional[str],
+    max_results: int
+) -> Tuple[str, ...]:
+    """
+    Rank documents for a normalized query and return the top document IDs.
+    
+    Uncached; search_documents_page caches the ranking per query and category.
+    """
+    # Phrase queries combine per-word and exact-phrase matches, so score each document
+    if len(query_norm.split()) > 1:
+        return tuple(doc['id'] for doc in _search_phrase(query_norm, category, max_results))
+    
+    # Restrict postings to the category bucket if specified
+    allowed = None
     if category:
-        documents = [doc for doc in documents if doc['category'].lower() == category.lower()]
+        allowed = _DOC_SETS_BY_CATEGORY.get(category)
+        if not allowed:
+            return ()
+    
+    # Sum weighted term frequencies of the query tokens via the inverted index
+    scores: Dict[int, float] = {}
+    for token in _tokenize(query_norm):
+        for idx, field, tf in _INVERTED_INDEX.get(token, ()):
+            if allowed is None or idx in allowed:
+                scores[idx] = scores.get(idx, 0.0) + FIELD_WEIGHTS[field] * tf
+    
+    # No whole-word hits: fall back to substring matching so partial words still match.
+    # Shorter queries would match nearly every document, so skip the corpus scan.
+    if not scores and len(query_norm) >= MIN_SUBSTRING_QUERY_LENGTH:
+        return tuple(doc['id'] for doc in _search_phrase(query_norm, category, max_results))
+    
+    top = heapq.nlargest(max_results, sorted(scores.items()), key=operator.itemgetter(1))
+    
+    return tuple(KNOWLEDGE_BASE[idx]['id'] for idx, _ in top)
+
+
+def _search_phrase(
+    query_lower: str,
+    category_lower: Optional[str],
+    max_results: int
+) -> List[Dict[str, Any]]:
+    """Score every document against a multi-word query"""
+    # Restrict to the category bucket if specified
+    indices = range(len(KNOWLEDGE_BASE))
+    if category_lower:
+        indices = _DOCS_BY_CATEGORY.get(category_lower, [])
     
     # Calculate relevance scores
+    query_bytes = query_lower.encode('utf-8')
+    query_tokens = list(dict.fromkeys(_tokenize(query_lower)))
     scored_docs = [
-        (doc, calculate_relevance_score(doc, query))
-        for doc in documents
+        (KNOWLEDGE_BASE[idx], calculate_relevance_score(idx, query_lower, query_bytes, query_tokens))
+        for idx in indices
     ]
     
-    # Sort by relevance and limit results
-    scored_docs.sort(key=lambda x: x[1], reverse=True)
-    results = [doc for doc, score in scored_docs if score > 0][:max_results]
+    # Select the top results without sorting the whole corpus
+    results = [
+        doc for doc, score in heapq.nlargest(max_results, scored_docs, key=operator.itemgetter(1))
+        if score > 0
+    ]
     
     return results
 
 
-async def get_document_by_id(document_id: str) -> Optional[Dict[str, Any]]:
+def get_document_by_id(document_id: str) -> Optional[Dict[str, Any]]:
     """Retrieve a specific document by ID"""
-    await asyncio.sleep(0.01)  # Simulate async I/O
-    
-    for doc in KNOWLEDGE_BASE:
-        if doc['id'] == document_id:
-            return doc
-    return None
+    return _ID_TO_DOC.get(document_id)
 
 
 def get_all_categories() -> List[str]:
     """Get list of all unique categories"""
-    categories = set(doc['category'] for doc in KNOWLEDGE_BASE)
-    return sorted(categories)
+    return list(_SORTED_CATEGORIES)
+
+
+# list_categories responses never change at runtime, so render them once
+_CATEGORIES_JSON_RESPONSE = _json_dumps({
+    "categories": [
+        {"name": cat, "document_count": _CATEGORY_COUNTS[cat]}
+        for cat in _SORTED_CATEGORIES
+    ],
+    "total_categories": len(_SORTED_CATEGORIES),
+    "total_documents": len(KNOWLEDGE_BASE)
+})
+_CATEGORIES_MD_RESPONSE = "\n".join([
+    "# Knowledge Base Categories",
+    f"Total documents: {len(KNOWLEDGE_BASE)}",
+    ""
+] + [
+    f"- **{cat}**: {_CATEGORY_COUNTS[cat]} document(s)"
+    for cat in _SORTED_CATEGORIES
+])
 
 
 # ============================================================================
@@ -390,16 +680,11 @@ server = Server("knowledge-base-server")
 # TOOL IMPLEMENTATIONS
 # ============================================================================
 
-@server.list_tools()
-async def list_tools() -> list[Tool]:
-    """List all available tools"""
-    return [
-        Tool(
-            name="search_knowledge_base",
-            description="""
-Search the knowledge base for relevant documentation and best practices.
+# Tool descriptions, input schemas and definitions are static, so build them once at import
+_SEARCH_TOOL_DESC = """Search the knowledge base for relevant documentation and best practices.
 
 This tool searches across titles, content, tags, and categories to find the most relevant documents.
+Single-word queries match whole words first; partial words (e.g. "auth") are only matched when no whole word does.
 Use this when you need to find information about specific topics, technologies, or patterns.
 
 **When to use:**
@@ -411,24 +696,22 @@ Use this when you need to find information about specific topics, technologies,
 - query: Keywords or phrases to search for (required)
 - category: Filter by category (optional): security, architecture, database, devops
 - max_results: Number of results to return (1-10, default: 5)
+- offset: Number of ranked results to skip, for the next page (default: 0)
+- cursor: Cursor from a previous response; pass it with the same query and category and the next offset to page without re-searching
 - format: Response format - 'json' or 'markdown' (default: markdown)
 - detail_level: 'concise' for summaries or 'detailed' for full content (default: concise)
 
 **Returns:**
 - Markdown or JSON formatted list of relevant documents with relevance-ranked results
 - Each result includes title, ID, category, tags, and content (based on detail_level)
+- A cursor and the next offset when more results are available
 - Empty result if no relevant documents found
 
 **Example usage:**
 - "Search for authentication best practices" → search_knowledge_base(query="authentication", detail_level="detailed")
-- "Find microservices patterns" → search_knowledge_base(query="microservices", category="architecture")
-            """.strip(),
-            inputSchema=SearchInput.model_json_schema()
-        ),
-        Tool(
-            name="get_document",
-            description="""
-Retrieve a specific document by its unique identifier.
+- "Find microservices patterns" → search_knowledge_base(query="microservices", category="architecture")"""
+
+_GET_DOCUMENT_TOOL_DESC = """Retrieve a specific document by its unique identifier.
 
 Use this tool when you have a document ID (from search results) and want to retrieve the full content.
 This is more efficient than searching when you know exactly which document you need.
@@ -451,14 +734,9 @@ This is more efficient than searching when you know exactly which document you n
 - Include the invalid ID in error message for debugging
 
 **Example usage:**
-- get_document(document_id="doc-001") → Returns full authentication best practices document
-            """.strip(),
-            inputSchema=GetDocumentInput.model_json_schema()
-        ),
-        Tool(
-            name="list_categories",
-            description="""
-List all available documentation categories in the knowledge base.
+- get_document(document_id="doc-001") → Returns full authentication best practices document"""
+
+_LIST_CATEGORIES_TOOL_DESC = """List all available documentation categories in the knowledge base.
 
 Use this to discover what categories of documentation are available before searching.
 Helpful for understanding the scope of the knowledge base.
@@ -476,11 +754,35 @@ Helpful for understanding the scope of the knowledge base.
 - Document count per category
 
 **Example usage:**
-- list_categories() → Returns: security, architecture, database, devops
-            """.strip(),
-            inputSchema=ListCategoriesInput.model_json_schema()
-        )
-    ]
+- list_categories() → Returns: security, architecture, database, devops"""
+
+_SEARCH_SCHEMA = SearchInput.model_json_schema()
+_GET_DOCUMENT_SCHEMA = GetDocumentInput.model_json_schema()
+_LIST_CATEGORIES_SCHEMA = ListCategoriesInput.model_json_schema()
+
+_TOOLS_LIST: list[Tool] = [
+    Tool(
+        name="search_knowledge_base",
+        description=_SEARCH_TOOL_DESC,
+        inputSchema=_SEARCH_SCHEMA
+    ),
+    Tool(
+        name="get_document",
+        description=_GET_DOCUMENT_TOOL_DESC,
+        inputSchema=_GET_DOCUMENT_SCHEMA
+    ),
+    Tool(
+        name="list_categories",
+        description=_LIST_CATEGORIES_TOOL_DESC,
+        inputSchema=_LIST_CATEGORIES_SCHEMA
+    )
+]
+
+
+@server.list_tools()
+async def list_tools() -> list[Tool]:
+    """List all available tools"""
+    return _TOOLS_LIST
 
 
 @server.call_tool()
@@ -490,16 +792,25 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     try:
         if name == "search_knowledge_base":
             # Validate input
-            search_input = SearchInput(**arguments)
+            search_input = _SEARCH_ADAPTER.validate_python(arguments)
             
             # Perform search
-            results = await search_documents(
+            page = search_documents_page(
                 query=search_input.query,
                 category=search_input.category,
-                max_results=search_input.max_results
+                max_results=search_input.max_results,
+                offset=search_input.offset,
+                cursor=search_input.cursor
             )
+            results = fit_results_to_limit(page.documents, search_input.detail_level)
+            next_offset = search_input.offset + len(results)
+            has_more = next_offset < page.total_results
             
             if not results:
+                if page.total_results:
+                    response = f"No more results for query: '{search_input.query}' "
+                    response += f"(all {page.total_results} result(s) already returned)"
+                    return [TextContent(type="text", text=response)]
                 response = f"No documents found matching query: '{search_input.query}'"
                 if search_input.category:
                     response += f" in category '{search_input.category}'"
@@ -509,35 +820,46 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             # Format response
             if search_input.format == ResponseFormat.JSON:
                 # JSON response
-                json_results = [
-                    {
+                detailed = search_input.detail_level == DetailLevel.DETAILED
+                json_results = []
+                for doc in results:
+                    meta = _DOC_META[_ID_TO_IDX[doc['id']]]
+                    json_results.append({
                         "id": doc['id'],
                         "title": doc['title'],
                         "category": doc['category'],
                         "tags": doc['tags'],
                         "updated": doc['updated'],
-                        "content": doc['content'].strip() if search_input.detail_level == DetailLevel.DETAILED else doc['content'].split('\n')[0].strip()
-                    }
-                    for doc in results
-                ]
-                response_text = json.dumps({
+                        "content": meta.content_stripped if detailed else meta.first_line
+                    })
+                response_text = _json_dumps({
                     "query": search_input.query,
                     "results_count": len(results),
+                    "total_results": page.total_results,
+                    "offset": search_input.offset,
+                    "next_offset": next_offset if has_more else None,
+                    "cursor": page.cursor,
                     "documents": json_results
-                }, indent=2)
+                })
             else:
                 # Markdown response
                 lines = [
                     f"# Search Results for: {search_input.query}",
-                    f"Found {len(results)} relevant document(s)",
+                    f"Found {page.total_results} relevant document(s)",
                     ""
                 ]
                 
-                for i, doc in enumerate(results, 1):
+                for i, doc in enumerate(results, search_input.offset + 1):
                     lines.append(f"### Result {i}")
-                    lines.append(format_document_markdown(doc, search_input.detail_level))
+                    format_document_markdown(doc, search_input.detail_level, lines)
                     lines.append("")
                 
+                if has_more:
+                    lines.append(
+                        f"More results available: call again with cursor=\"{page.cursor}\" "
+                        f"and offset={next_offset}"
+                    )
+                
                 response_text = "\n".join(lines)
             
             # Truncate if needed
@@ -547,10 +869,10 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         
         elif name == "get_document":
             # Validate input
-            doc_input = GetDocumentInput(**arguments)
+            doc_input = _GET_DOCUMENT_ADAPTER.validate_python(arguments)
             
             # Get document
-            doc = await get_document_by_id(doc_input.document_id)
+            doc = get_document_by_id(doc_input.document_id)
             
             if not doc:
                 response = f"Document not found: {doc_input.document_id}\n\n"
@@ -560,9 +882,11 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             
             # Format response
             if doc_input.format == ResponseFormat.JSON:
-                response_text = json.dumps(doc, indent=2)
+                response_text = _json_dumps(doc)
             else:
-                response_text = format_document_markdown(doc, DetailLevel.DETAILED)
+                lines = []
+                format_document_markdown(doc, DetailLevel.DETAILED, lines)
+                response_text = "\n".join(lines)
             
             # Truncate if needed
             response_text = truncate_text(response_text)
@@ -571,35 +895,13 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         
         elif name == "list_categories":
             # Validate input
-            cat_input = ListCategoriesInput(**arguments)
-            
-            # Get categories with counts
-            categories = {}
-            for doc in KNOWLEDGE_BASE:
-                cat = doc['category']
-                categories[cat] = categories.get(cat, 0) + 1
+            cat_input = _LIST_CATEGORIES_ADAPTER.validate_python(arguments)
             
-            # Format response
+            # Responses are static and prerendered at import
             if cat_input.format == ResponseFormat.JSON:
-                response_text = json.dumps({
-                    "categories": [
-                        {"name": cat, "document_count": count}
-                        for cat, count in sorted(categories.items())
-                    ],
-                    "total_categories": len(categories),
-                    "total_documents": len(KNOWLEDGE_BASE)
-                }, indent=2)
+                response_text = _CATEGORIES_JSON_RESPONSE
             else:
-                lines = [
-                    "# Knowledge Base Categories",
-                    f"Total documents: {len(KNOWLEDGE_BASE)}",
-                    ""
-                ]
-                
-                for cat, count in sorted(categories.items()):
-                    lines.append(f"- **{cat}**: {count} document(s)")
-                
-                response_text = "\n".join(lines)
+                response_text = _CATEGORIES_MD_RESPONSE
             
             return [TextContent(type="text", text=response_text)]
         